@@ -0,0 +1,48 @@
+import os
+from sqlalchemy import create_engine, event
+
+PROFILES = {
+    "default": {},
+    "balanced": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY"
+    },
+    "durable": {
+        "busy_timeout": 10000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -64000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT"
+    },
+    "fast": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY"
+    }
+}
+DEFAULT_PROFILE = os.environ.get("SQLITE_PROFILE", "balanced")
+
+
+def create_sqlite_engine(url: str = 'sqlite:///example.db', profile: str = None, **pragmas):
+    profile = profile or DEFAULT_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"unknown SQLite profile: {profile}")
+    settings = dict(PROFILES[profile], **pragmas)
+    engine = create_engine(url)
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    return engine
@@ -0,0 +1,212 @@
+import argparse
+import functools
+import itertools
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import List, Tuple
+from xml.sax.saxutils import quoteattr
+from models import create_category, create_comment, create_event, create_group, create_user
+
+WORDS = ("концерт", "лекция", "выставка", "фестиваль", "встреча", "мастер-класс", "семинар", "турнир",
+         "кино", "наука", "музыка", "искусство", "спорт", "технологии", "книги", "театр")
+PLACES = ("ул. Академика Зелинского, д. 6", "Ленинский пр-т, д. 4", "ул. Тверская, д. 13",
+          "Парк Горького", "ВДНХ, павильон 75", "Библиотека им. Ленина", "ДК Зил", "Лужники")
+
+_users = []
+_user_weights = []
+_categories = []
+_category_weights = []
+_comments_per_event = 0
+
+
+def zipf_weights(count: int, skew: float) -> List[float]:
+    weights = [1 / (rank ** skew) for rank in range(1, count + 1)]
+    return list(itertools.accumulate(weights))
+
+
+def random_id(rng: random.Random) -> int:
+    return rng.getrandbits(63)
+
+
+def random_date(rng: random.Random) -> str:
+    return f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2020, 2025)}"
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+
+def build_reference_data(groups: int, users: int, categories: int, rng: random.Random):
+    id_source = functools.partial(random_id, rng)
+    group_list = [create_group(f"Группа {i}", i % 2 == 0, i % 3 == 0, i == 0, id_source) for i in range(groups)]
+    user_list = [create_user(f"Пользователь {i}", f"user{i}@example.com", rng.choice(group_list), id_source)
+                 for i in range(users)]
+    category_list = [create_category(f"Категория {i}", random_text(rng, 4), id_source) for i in range(categories)]
+    return group_list, user_list, category_list
+
+
+def init_worker(users, categories, skew: float, comments_per_event: int) -> None:
+    global _users, _user_weights, _categories, _category_weights, _comments_per_event
+    _users = users
+    _categories = categories
+    _user_weights = zipf_weights(len(users), skew)
+    _category_weights = zipf_weights(len(categories), skew)
+    _comments_per_event = comments_per_event
+
+
+def generate_chunk(task: Tuple[int, int]) -> Tuple[List[tuple], List[tuple]]:
+    seed, count = task
+    rng = random.Random(seed)
+    id_source = functools.partial(random_id, rng)
+    events = []
+    comments = []
+    authors = rng.choices(_users, cum_weights=_user_weights, k=count)
+    event_categories = rng.choices(_categories, cum_weights=_category_weights, k=count)
+    for author, category in zip(authors, event_categories):
+        event = create_event(random_text(rng, 3), author, random_text(rng, 8), random_text(rng, 30),
+                             random_date(rng), rng.choice(PLACES), "", category, id_source)
+        for _ in range(rng.randint(0, 2 * _comments_per_event)):
+            commenter = rng.choices(_users, cum_weights=_user_weights)[0]
+            create_comment(commenter, random_date(rng), random_text(rng, 12), event, id_source)
+        events.append((event.event_id, event.title, author.user_id, author.name, event.announcement,
+                       event.description, event.date, event.place, category.category_id, category.title))
+        comments.extend((comment.comment_id, comment.author.user_id, comment.date, comment.text)
+                        for comment in event.feedback)
+    return events, comments
+
+
+class SqliteWriter:
+    def __init__(self, path: str):
+        from sqlalchemy import create_engine
+        import orm
+
+        if os.path.exists(path):
+            os.remove(path)
+        self.orm = orm
+        self.engine = create_engine(f"sqlite:///{path}")
+        orm.metadata.create_all(self.engine)
+
+    def write_reference(self, groups, users, categories) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(self.orm.groups.insert(), [
+                {"id": g.group_id, "title": g.title, "create_rights": g.create_rights,
+                 "delete_rights": g.delete_rights, "admin_access": g.admin_access} for g in groups])
+            connection.execute(self.orm.users.insert(), [
+                {"id": u.user_id, "name": u.name, "email": u.email, "group": u.group.group_id} for u in users])
+            connection.execute(self.orm.categories.insert(), [
+                {"id": c.category_id, "title": c.title, "description": c.description} for c in categories])
+
+    def write_chunk(self, events, comments) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(self.orm.events.insert(), [
+                {"id": e[0], "title": e[1], "author": e[2], "announcement": e[4], "description": e[5],
+                 "date": e[6], "place": e[7], "category": e[8]} for e in events])
+            if comments:
+                connection.execute(self.orm.comments.insert(), [
+                    {"id": c[0], "author": c[1], "date": c[2], "text": c[3]} for c in comments])
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+class XmlWriter:
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+        self.last_id = 0
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n<events>\n')
+
+    def write_reference(self, groups, users, categories) -> None:
+        pass
+
+    def write_chunk(self, events, comments) -> None:
+        lines = []
+        for e in events:
+            self.last_id += 1
+            attributes = {"id": self.last_id, "title": e[1], "author": e[3], "announcement": e[4],
+                          "description": e[5], "date": e[6], "place": e[7], "category": e[9]}
+            lines.append("    <event " + " ".join(f"{key}={quoteattr(str(value))}"
+                                                 for key, value in attributes.items()) + "/>\n")
+        self.file.write("".join(lines))
+
+    def close(self) -> None:
+        self.file.write("</events>\n")
+        self.file.close()
+
+
+class JsonWriter:
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+        self.separator = "\n"
+        self.file.write("[")
+
+    def write_reference(self, groups, users, categories) -> None:
+        pass
+
+    def write_chunk(self, events, comments) -> None:
+        parts = []
+        for e in events:
+            record = {"id": e[0], "title": e[1], "author": e[3], "announcement": e[4], "description": e[5],
+                      "date": e[6], "place": e[7], "category": e[9]}
+            parts.append(self.separator + "    " + json.dumps(record, ensure_ascii=False))
+            self.separator = ",\n"
+        self.file.write("".join(parts))
+
+    def close(self) -> None:
+        self.file.write("\n]\n")
+        self.file.close()
+
+
+WRITERS = {"sqlite": SqliteWriter, "xml": XmlWriter, "json": JsonWriter}
+EXTENSIONS = {"sqlite": "db", "xml": "xml", "json": "json"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic events dataset")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--groups", type=int, default=5)
+    parser.add_argument("--comments-per-event", type=int, default=2)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for authors and categories")
+    parser.add_argument("--backend", choices=sorted(WRITERS), default="sqlite")
+    parser.add_argument("--output", help="defaults to generated_events.<db|xml|json>")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be a positive integer")
+    if args.output is None:
+        args.output = f"generated_events.{EXTENSIONS[args.backend]}"
+
+    started = time.perf_counter()
+    rng = random.Random(args.seed)
+    groups, users, categories = build_reference_data(args.groups, args.users, args.categories, rng)
+    writer = WRITERS[args.backend](args.output)
+    writer.write_reference(groups, users, categories)
+
+    sizes = [args.chunk_size] * (args.events // args.chunk_size)
+    if args.events % args.chunk_size:
+        sizes.append(args.events % args.chunk_size)
+    tasks = [(args.seed * 1_000_003 + index + 1, size) for index, size in enumerate(sizes)]
+
+    written = 0
+    try:
+        with Pool(args.workers, initializer=init_worker,
+                  initargs=(users, categories, args.skew, args.comments_per_event)) as pool:
+            for events, comments in pool.imap(generate_chunk, tasks):
+                writer.write_chunk(events, comments)
+                written += len(events)
+                print(f"\r{written:,}/{args.events:,} событий", end="", flush=True)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n[готово]: {written:,} событий за {elapsed:.1f} с ({written / elapsed:,.0f} событий/с) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
-from sqlalchemy import create_engine, Column, Integer, String
+from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import sessionmaker, declarative_base
 from typing import List
+from engine import create_sqlite_engine
 
 Base = declarative_base()
-engine = create_engine('sqlite:///example.db')
+engine = create_sqlite_engine('sqlite:///example.db')
 Session = sessionmaker(bind=engine)
 
 
@@ -44,20 +45,27 @@ class IRepository(ABC):
 
 
 class EventRepository(IRepository):
-    def __init__(self, session):
+    def __init__(self, session, autocommit: bool = True):
         self.session = session
+        self.autocommit = autocommit
+
+    def _commit(self):
+        if self.autocommit:
+            self.session.commit()
+        else:
+            self.session.flush()
 
     def add(self, event: Event):
         self.session.add(event)
-        self.session.commit()
+        self._commit()
 
     def delete(self, event: Event):
         self.session.delete(event)
-        self.session.commit()
+        self._commit()
 
     def update(self, event: Event):
         self.session.merge(event)
-        self.session.commit()
+        self._commit()
 
     def get(self, id: int) -> Event:
         return self.session.query(Event).get(id)
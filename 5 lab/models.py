@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, List
 import uuid
 
 
@@ -105,32 +105,36 @@ class Event:
                 self.feedback == other.feedback)
 
 
-def create_user(name: str, email: str, group: Group) -> User:
-    user_id = int(uuid.uuid4())
+def new_id() -> int:
+    return uuid.uuid4().int >> 65
+
+
+def create_user(name: str, email: str, group: Group, id_source: Callable[[], int] = new_id) -> User:
+    user_id = id_source()
     user = User(user_id, name, email, group)
     return user
 
 
-def create_event(title: str, author: User, announcement: str, description: str, date: str, place: str, photo: str, category: Category) -> Event:
+def create_event(title: str, author: User, announcement: str, description: str, date: str, place: str, photo: str, category: Category, id_source: Callable[[], int] = new_id) -> Event:
     feedback = []
-    event_id = int(uuid.uuid4())
+    event_id = id_source()
     event = Event(event_id, title, author, announcement, description, date, place, photo, category, feedback)
     return event
 
 
-def create_comment(author: User, date: str, text: str, event: Event):
-    comment_id = int(uuid.uuid4())
+def create_comment(author: User, date: str, text: str, event: Event, id_source: Callable[[], int] = new_id):
+    comment_id = id_source()
     comment = Comment(comment_id, author, date, text)
     event.feedback.append(comment)
 
 
-def create_group(title: str, create_rights: bool, delete_rights: bool, admin_access: bool) -> Group:
-    group_id = int(uuid.uuid4())
+def create_group(title: str, create_rights: bool, delete_rights: bool, admin_access: bool, id_source: Callable[[], int] = new_id) -> Group:
+    group_id = id_source()
     group = Group(group_id, title, create_rights, delete_rights, admin_access)
     return group
 
 
-def create_category(title: str, description: str) -> Category:
-    category_id = int(uuid.uuid4())
+def create_category(title: str, description: str, id_source: Callable[[], int] = new_id) -> Category:
+    category_id = id_source()
     category = Category(category_id, title, description)
     return category
@@ -1,10 +1,21 @@
 from abc import ABC, abstractmethod
-from sqlalchemy import text
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
 import models
+import orm
 from models import *
 
 
 class AbstractRepository(ABC):
+    table = None
+    columns = ()
+    batch_size = 1000
+    delete_chunk_size = 900
+
+    def __init__(self, session, autocommit: bool = True):
+        self.session = session
+        self.autocommit = autocommit
+
     @abstractmethod
     def get_by_id(self, obj_id: int):
         pass
@@ -21,10 +32,76 @@ class AbstractRepository(ABC):
     def delete(self, obj_id: int):
         pass
 
+    @abstractmethod
+    def to_row(self, item) -> dict:
+        pass
+
+    def _commit(self):
+        if self.autocommit:
+            self.session.commit()
+        else:
+            self.session.flush()
+
+    def _execute_batches(self, statement, items):
+        rows = [self.to_row(item) for item in items]
+        try:
+            for start in range(0, len(rows), self.batch_size):
+                self.session.execute(statement, rows[start:start + self.batch_size])
+            self._commit()
+        except Exception:
+            if self.autocommit:
+                self.session.rollback()
+            raise
+
+    def add_many(self, items):
+        self.upsert_many(items, update=False)
+
+    def _table(self):
+        return orm.metadata.tables[self.table]
+
+    def upsert_many(self, items, update: bool = True):
+        table = self._table()
+        statement = insert(table)
+        if update:
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={column: statement.excluded[column] for column in self.columns if column != "id"})
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[table.c.id])
+        self._execute_batches(statement, items)
+
+    def upsert(self, item, update: bool = True):
+        self.upsert_many([item], update)
+
+    def _execute_deletes(self, statements) -> int:
+        deleted = 0
+        try:
+            for statement in statements:
+                deleted += self.session.execute(statement).rowcount
+            self._commit()
+        except Exception:
+            if self.autocommit:
+                self.session.rollback()
+            raise
+        return deleted
+
+    def delete_many(self, ids) -> int:
+        table = self._table()
+        ids = list(ids)
+        return self._execute_deletes(delete(table).where(table.c.id.in_(ids[start:start + self.delete_chunk_size]))
+                                     for start in range(0, len(ids), self.delete_chunk_size))
+
+    def delete_where(self, *conditions, **values) -> int:
+        if not conditions and not values:
+            raise ValueError("delete_where requires at least one condition")
+        table = self._table()
+        conditions += tuple(table.c[column] == value for column, value in values.items())
+        return self._execute_deletes([delete(table).where(*conditions)])
+
 
 class GroupRepository(AbstractRepository):
-    def __init__(self, session):
-        self.session = session
+    table = "groups"
+    columns = ("id", "title", "create_rights", "delete_rights", "admin_access")
 
     def get_by_id(self, obj_id: int) -> Group:
         return self.session.query(models.Group).filter_by(id=obj_id).first()
@@ -33,20 +110,19 @@ class GroupRepository(AbstractRepository):
         return self.session.query(Group).all()
 
     def add(self, group: Group):
-        if self.get_by_id(group.group_id) is None:
-            self.session.execute(text(f"INSERT INTO groups (id, title, create_rights, delete_rights, admin_access) VALUES ('{group.group_id}', '{group.title}', '{group.create_rights}', '{group.delete_rights}', '{group.admin_access}')"))
-            self.session.commit()
+        self.upsert(group, update=False)
 
     def delete(self, obj_id: int):
-        group = self.get_by_id(obj_id)
-        if group is not None:
-            self.session.delete(group)
-            self.session.commit()
+        self.delete_many([obj_id])
+
+    def to_row(self, group: Group) -> dict:
+        return {"id": group.group_id, "title": group.title, "create_rights": group.create_rights,
+                "delete_rights": group.delete_rights, "admin_access": group.admin_access}
 
 
 class CategoryRepository(AbstractRepository):
-    def __init__(self, session):
-        self.session = session
+    table = "categories"
+    columns = ("id", "title", "description")
 
     def get_by_id(self, obj_id: int) -> Category:
         return self.session.query(models.Category).filter_by(id=obj_id).first()
@@ -55,20 +131,18 @@ class CategoryRepository(AbstractRepository):
         return self.session.query(Category).all()
 
     def add(self, category: Category):
-        if self.get_by_id(category.category_id) is None:
-            self.session.execute(text(f"INSERT INTO categories (id, title, description) VALUES ('{category.category_id}', '{category.title}', '{category.description}')"))
-            self.session.commit()
+        self.upsert(category, update=False)
 
     def delete(self, obj_id: int):
-        category = self.get_by_id(obj_id)
-        if category is not None:
-            self.session.delete(category)
-            self.session.commit()
+        self.delete_many([obj_id])
+
+    def to_row(self, category: Category) -> dict:
+        return {"id": category.category_id, "title": category.title, "description": category.description}
 
 
 class UserRepository(AbstractRepository):
-    def __init__(self, session):
-        self.session = session
+    table = "users"
+    columns = ("id", "name", "email", "group")
 
     def get_by_id(self, obj_id: int) -> User:
         return self.session.query(models.User).filter_by(id=obj_id).first()
@@ -77,20 +151,18 @@ class UserRepository(AbstractRepository):
         return self.session.query(User).all()
 
     def add(self, user: User):
-        if self.get_by_id(user.user_id) is None:
-            self.session.execute(text(f"INSERT INTO users (id, name, email, group) VALUES ('{user.user_id}', '{user.name}', '{user.email}', '{user.group.group_id}')"))
-            self.session.commit()
+        self.upsert(user, update=False)
 
     def delete(self, obj_id: int):
-        user = self.get_by_id(obj_id)
-        if user is not None:
-            self.session.delete(user)
-            self.session.commit()
+        self.delete_many([obj_id])
+
+    def to_row(self, user: User) -> dict:
+        return {"id": user.user_id, "name": user.name, "email": user.email, "group": user.group.group_id}
 
 
 class EventRepository(AbstractRepository):
-    def __init__(self, session):
-        self.session = session
+    table = "events"
+    columns = ("id", "title", "author", "announcement", "description", "date", "place", "category")
 
     def get_by_id(self, obj_id: int) -> Event:
         return self.session.query(models.Event).filter_by(id=obj_id).first()
@@ -99,20 +171,20 @@ class EventRepository(AbstractRepository):
         return self.session.query(Event).all()
 
     def add(self, event: Event):
-        if self.get_by_id(event.event_id) is None:
-            self.session.execute(text(f"INSERT INTO events (id, title, author, announcement, description, date, place, category) VALUES ('{event.event_id}', '{event.title}', '{event.author.user_id}', '{event.announcement}', '{event.description}', '{event.date}', '{event.place}', '{event.category.category_id}')"))
-            self.session.commit()
+        self.upsert(event, update=False)
 
     def delete(self, obj_id: int):
-        event = self.get_by_id(obj_id)
-        if event is not None:
-            self.session.delete(event)
-            self.session.commit()
+        self.delete_many([obj_id])
+
+    def to_row(self, event: Event) -> dict:
+        return {"id": event.event_id, "title": event.title, "author": event.author.user_id,
+                "announcement": event.announcement, "description": event.description, "date": event.date,
+                "place": event.place, "category": event.category.category_id}
 
 
 class CommentRepository(AbstractRepository):
-    def __init__(self, session):
-        self.session = session
+    table = "comments"
+    columns = ("id", "author", "date", "text")
 
     def get_by_id(self, obj_id: int) -> Comment:
         return self.session.query(models.Comment).filter_by(id=obj_id).first()
@@ -121,13 +193,10 @@ class CommentRepository(AbstractRepository):
         return self.session.query(Comment).all()
 
     def add(self, comment: Comment):
-        if self.get_by_id(comment.comment_id) is None:
-            self.session.execute(text(
-                f"INSERT INTO comments (id, author, date, text) VALUES ('{comment.comment_id}', '{comment.author.user_id}', '{comment.date}', '{comment.text}')"))
-            self.session.commit()
+        self.upsert(comment, update=False)
 
     def delete(self, obj_id: int):
-        comment = self.get_by_id(obj_id)
-        if comment is not None:
-            self.session.delete(comment)
-            self.session.commit()
+        self.delete_many([obj_id])
+
+    def to_row(self, comment: Comment) -> dict:
+        return {"id": comment.comment_id, "author": comment.author.user_id, "date": comment.date, "text": comment.text}
@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from repositories import CategoryRepository, CommentRepository, EventRepository, GroupRepository, UserRepository
+
+DEFAULT_REPOSITORIES = {
+    "groups": GroupRepository,
+    "categories": CategoryRepository,
+    "users": UserRepository,
+    "events": EventRepository,
+    "comments": CommentRepository
+}
+
+
+class UnitOfWork:
+    def __init__(self, session_factory, **repositories):
+        self.session_factory = session_factory
+        self.repository_classes = repositories or DEFAULT_REPOSITORIES
+        self.session = None
+        self.commits = 0
+
+    def __enter__(self):
+        self.session = self.session_factory()
+        for name, repository_class in self.repository_classes.items():
+            setattr(self, name, repository_class(self.session, autocommit=False))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.session.close()
+            self.session = None
+
+    def commit(self):
+        self.session.commit()
+        self.commits += 1
+
+    def rollback(self):
+        self.session.rollback()
+
+    @contextmanager
+    def savepoint(self):
+        nested = self.session.begin_nested()
+        try:
+            yield nested
+        except Exception:
+            nested.rollback()
+            raise
+        else:
+            nested.commit()
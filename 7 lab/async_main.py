@@ -0,0 +1,78 @@
+from typing import AsyncIterator
+from quart import Quart, Response, jsonify, request
+from models.event import Event
+from repositories.xml_event_repository import XmlEventRepository
+from services.event_service import EventService
+from utils.query import decode_cursor, encode_cursor, parse_event_filter, parse_limit
+from utils.streaming import JsonArrayChunker
+
+app = Quart(__name__)
+
+SERVICE_WORKERS = 8
+SEARCH_LIMIT = 10
+
+event_repository = XmlEventRepository(file_path="events.xml", journal=True)
+event_service = EventService(event_repository, max_workers=SERVICE_WORKERS)
+
+
+async def stream_json(events: AsyncIterator[Event], limit=None) -> AsyncIterator[bytes]:
+    chunker = JsonArrayChunker()
+    count = 0
+    async for event in events:
+        if limit is not None and count >= limit:
+            break
+        count += 1
+        chunk = chunker.add(event)
+        if chunk is not None:
+            yield chunk.encode()
+    yield chunker.close().encode()
+
+
+@app.route('/events')
+async def get_events():
+    stream = request.args.get("stream") in ("1", "true")
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        after = decode_cursor(request.args.get("cursor"))
+        event_filter = parse_event_filter(request.args)
+        if stream:
+            events = event_service.aiter_events(event_filter, after)
+        else:
+            events, next_cursor = await event_service.afind_events(event_filter, after, limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if stream:
+        return Response(stream_json(events, limit), mimetype="application/json")
+
+    response = jsonify([event.to_dict() for event in events])
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_cursor)
+    return response
+
+
+@app.route('/events/search')
+async def search_events():
+    query = request.args.get("q", "")
+    try:
+        limit = parse_limit(request.args.get("limit")) or SEARCH_LIMIT
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify([event.to_dict() for event in await event_service.asearch(query, limit)])
+
+
+@app.route('/events/<int:event_id>')
+async def get_event(event_id: int):
+    event = await event_service.aget_event_by_id(event_id)
+    if event is None:
+        return jsonify({"error": "event not found"}), 404
+    return jsonify(event.to_dict())
+
+
+@app.after_serving
+async def shutdown():
+    event_service.close()
+
+
+if __name__ == '__main__':
+    app.run()
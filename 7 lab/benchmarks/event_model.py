@@ -0,0 +1,89 @@
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.event import Event
+
+EVENTS = 100_000
+ROUNDS = 5
+
+
+class LegacyEvent:
+    def __init__(self, title, author, announcement, description, date, place, category):
+        self.title = title
+        self.author = author
+        self.announcement = announcement
+        self.description = description
+        self.date = date
+        self.place = place
+        self.category = category
+
+    @classmethod
+    def from_dict(cls, dict):
+        return cls(**dict)
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "author": self.author,
+            "announcement": self.announcement,
+            "description": self.description,
+            "date": self.date,
+            "place": self.place,
+            "category": self.category
+        }
+
+
+def sample_dict(i: int) -> dict:
+    return {
+        "title": f"Event {i}",
+        "author": f"Author {i % 100}",
+        "announcement": "Announcement",
+        "description": "Description",
+        "date": "04.06.2002",
+        "place": f"Place {i % 50}",
+        "category": f"Category {i % 10}"
+    }
+
+
+def memory_per_event(cls, dicts) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    events = [cls.from_dict(d) for d in dicts]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del events
+    return size / len(dicts)
+
+
+def throughput(statement, count: int) -> float:
+    best = min(timeit.repeat(statement, number=1, repeat=ROUNDS))
+    return count / best
+
+
+def run(cls, dicts) -> dict:
+    events = [cls.from_dict(d) for d in dicts]
+    return {
+        "bytes_per_event": memory_per_event(cls, dicts),
+        "from_dict_per_sec": throughput(lambda: [cls.from_dict(d) for d in dicts], len(dicts)),
+        "to_dict_per_sec": throughput(lambda: [event.to_dict() for event in events], len(events))
+    }
+
+
+def main():
+    legacy_dicts = [sample_dict(i) for i in range(EVENTS)]
+    dicts = [dict(d, id=i + 1) for i, d in enumerate(legacy_dicts)]
+    results = {"legacy": run(LegacyEvent, legacy_dicts), "slotted": run(Event, dicts)}
+
+    print(f"{'':10}{'bytes/event':>14}{'from_dict/s':>16}{'to_dict/s':>16}")
+    for name, result in results.items():
+        print(f"{name:10}{result['bytes_per_event']:>14.1f}"
+              f"{result['from_dict_per_sec']:>16,.0f}{result['to_dict_per_sec']:>16,.0f}")
+
+
+if __name__ == '__main__':
+    main()
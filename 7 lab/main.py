@@ -1,17 +1,191 @@
-from flask import Flask, jsonify
+import functools
+import hashlib
+import itertools
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+from urllib.parse import urlencode
+from flask import Flask, Response, g, jsonify, make_response, request, stream_with_context
+from models.event import Event
 from repositories.xml_event_repository import XmlEventRepository
 from services.event_service import EventService
+from utils.lru_cache import LRUCache
+from utils.metrics import MetricsRegistry, instrument
+from utils.query import decode_cursor, encode_cursor, parse_event_filter, parse_limit
+from utils.streaming import JsonArrayChunker
 
 app = Flask(__name__)
 
-event_repository = XmlEventRepository(file_path="events.xml")
-event_service = EventService(event_repository)
+RESPONSE_CACHE_SIZE = 256
+CACHED_HEADERS = ("X-Next-Cursor",)
+SEARCH_LIMIT = 10
+
+metrics = MetricsRegistry()
+event_repository = instrument(XmlEventRepository(file_path="events.xml", journal=True), "repository", metrics)
+event_service = instrument(EventService(event_repository), "service", metrics)
+response_cache = LRUCache(max_entries=RESPONSE_CACHE_SIZE)
+event_service.subscribe(response_cache.clear)
+
+
+def repository_metrics() -> dict:
+    cache_stats = response_cache.stats()
+    return {
+        "repository_bytes_read_total": event_repository.bytes_read,
+        "repository_bytes_written_total": event_repository.bytes_written,
+        "repository_cache_hits_total": event_repository.cache_hits,
+        "repository_cache_misses_total": event_repository.cache_misses,
+        "response_cache_hits_total": cache_stats["hits"],
+        "response_cache_misses_total": cache_stats["misses"],
+        "response_cache_evictions_total": cache_stats["evictions"],
+        "response_cache_entries": cache_stats["entries"]
+    }
+
+
+metrics.register_collector(repository_metrics)
+
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    started = g.pop("request_started", None)
+    if started is not None and request.endpoint is not None:
+        metrics.observe("http", request.endpoint, time.perf_counter() - started, response.status_code >= 500)
+    return response
+
+
+def request_key() -> str:
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"{request.path}?{query}"
+
+
+def conditional(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version = event_service.data_version()
+        if version is None:
+            return view(*args, **kwargs)
+
+        etag = hashlib.sha1(f"{version}:{request_key()}".encode()).hexdigest()
+        last_modified = datetime.fromtimestamp(int(event_service.last_modified()), tz=timezone.utc)
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains(etag)
+        else:
+            not_modified = request.if_modified_since is not None and last_modified <= request.if_modified_since
+        if not_modified:
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        return response
+
+    return wrapper
+
+
+def cached(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request_key()
+        version = event_service.data_version()
+        entry = response_cache.get(key, version)
+        if entry is not None:
+            body, headers = entry
+            return Response(body, mimetype="application/json", headers=headers)
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            response_cache.put(key, (response.get_data(), headers), version)
+        return response
+
+    return wrapper
+
+
+def stream_json(events: Iterable[Event]) -> Iterator[str]:
+    chunker = JsonArrayChunker()
+    for event in events:
+        chunk = chunker.add(event)
+        if chunk is not None:
+            yield chunk
+    yield chunker.close()
 
 
 @app.route('/events')
+@conditional
+@cached
 def get_events():
-    events = event_service.get_all_events()
-    return jsonify([event.to_dict() for event in events])
+    stream = request.args.get("stream") in ("1", "true")
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        after = decode_cursor(request.args.get("cursor"))
+        event_filter = parse_event_filter(request.args)
+        if stream:
+            events = event_service.iter_events(event_filter, after)
+        else:
+            events, next_cursor = event_service.find_events(event_filter, after, limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if stream:
+        if limit is not None:
+            events = itertools.islice(events, limit)
+        return Response(stream_with_context(stream_json(events)), mimetype="application/json")
+
+    response = jsonify([event.to_dict() for event in events])
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_cursor)
+    return response
+
+
+@app.route('/events/search')
+@conditional
+@cached
+def search_events():
+    query = request.args.get("q", "")
+    try:
+        limit = parse_limit(request.args.get("limit")) or SEARCH_LIMIT
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify([event.to_dict() for event in event_service.search(query, limit)])
+
+
+@app.route('/events/<int:event_id>')
+@conditional
+@cached
+def get_event(event_id: int):
+    event = event_service.get_event_by_id(event_id)
+    if event is None:
+        return jsonify({"error": "event not found"}), 404
+    return jsonify(event.to_dict())
+
+
+@app.route('/metrics')
+def get_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route('/cache/stats')
+def get_cache_stats():
+    return jsonify(response_cache.stats())
+
+
+def test_stream_with_cursor():
+    client = app.test_client()
+    cursor = client.get('/events?limit=1').headers["X-Next-Cursor"]
+
+    paged = client.get(f'/events?cursor={cursor}')
+    streamed = client.get(f'/events?stream=1&cursor={cursor}')
+    assert streamed.status_code == 200
+    assert streamed.get_json() == paged.get_json()
+    assert all(event["id"] is not None for event in streamed.get_json())
+
+    print("\n[тест потоковой выдачи с курсором]: успешно")
 
 
 if __name__ == '__main__':
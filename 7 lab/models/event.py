@@ -1,5 +1,8 @@
 class Event:
-    def __init__(self, title, author, announcement, description, date, place, category):
+    __slots__ = ("id", "title", "author", "announcement", "description", "date", "place", "category")
+
+    def __init__(self, title, author, announcement, description, date, place, category, id=None):
+        self.id = id
         self.title = title
         self.author = author
         self.announcement = announcement
@@ -10,10 +13,18 @@ class Event:
 
     @classmethod
     def from_dict(cls, dict):
-        return cls(**dict)
+        event_id = dict.get("id")
+        return cls(dict["title"], dict["author"], dict["announcement"], dict["description"],
+                   dict["date"], dict["place"], dict["category"],
+                   int(event_id) if event_id is not None else None)
+
+    def copy(self):
+        return Event(self.title, self.author, self.announcement, self.description,
+                     self.date, self.place, self.category, self.id)
 
     def to_dict(self):
         return {
+            "id": self.id,
             "title": self.title,
             "author": self.author,
             "announcement": self.announcement,
@@ -22,4 +33,3 @@ class Event:
             "place": self.place,
             "category": self.category
         }
-
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+from models.event import Event
+from utils.dates import parse_date
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    category: Optional[str] = None
+    place: Optional[str] = None
+    author: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    def is_empty(self) -> bool:
+        return (self.category is None and self.place is None and self.author is None and
+                self.date_from is None and self.date_to is None)
+
+    def matches(self, event: Event) -> bool:
+        if self.category is not None and event.category != self.category:
+            return False
+        if self.place is not None and event.place != self.place:
+            return False
+        if self.author is not None and event.author != self.author:
+            return False
+        if self.date_from is not None or self.date_to is not None:
+            event_date = parse_date(event.date)
+            if event_date is None:
+                return False
+            if self.date_from is not None and event_date < self.date_from:
+                return False
+            if self.date_to is not None and event_date > self.date_to:
+                return False
+        return True
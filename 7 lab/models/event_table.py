@@ -0,0 +1,116 @@
+from array import array
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from models.event import Event
+from utils.dates import date_ordinal
+
+NO_DATE = 0
+
+
+class _Dictionary:
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class EventTable:
+    CATEGORICAL = ("category", "place", "author")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.titles: List[str] = []
+        self.announcements: List[str] = []
+        self.descriptions: List[str] = []
+        self.raw_dates: List[str] = []
+        self.dates = array("l")
+        self._ordinals: Dict[str, int] = {}
+        self.codes = {field: array("l") for field in self.CATEGORICAL}
+        self.dictionaries = {field: _Dictionary() for field in self.CATEGORICAL}
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "EventTable":
+        table = cls()
+        for event in events:
+            table.append(event)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, event: Event) -> None:
+        self.ids.append(event.id if event.id is not None else 0)
+        self.titles.append(event.title)
+        self.announcements.append(event.announcement)
+        self.descriptions.append(event.description)
+        self.raw_dates.append(event.date)
+        ordinal = self._ordinals.get(event.date)
+        if ordinal is None:
+            ordinal = date_ordinal(event.date) or NO_DATE
+            self._ordinals[event.date] = ordinal
+        self.dates.append(ordinal)
+        for field in self.CATEGORICAL:
+            self.codes[field].append(self.dictionaries[field].encode(getattr(event, field)))
+
+    def row(self, index: int) -> Event:
+        values = {field: self.dictionaries[field].values[self.codes[field][index]] for field in self.CATEGORICAL}
+        return Event(self.titles[index], values["author"], self.announcements[index], self.descriptions[index],
+                     self.raw_dates[index], values["place"], values["category"], self.ids[index] or None)
+
+    def rows(self, indices: Iterable[int]) -> List[Event]:
+        return [self.row(index) for index in indices]
+
+    def count_by(self, field: str) -> Dict[str, int]:
+        values = self.dictionaries[field].values
+        return {values[code]: count for code, count in Counter(self.codes[field]).items()}
+
+    def filter(self, category: Optional[str] = None, place: Optional[str] = None, author: Optional[str] = None,
+               date_from: Optional[date] = None, date_to: Optional[date] = None) -> List[int]:
+        indices: Optional[List[int]] = None
+        for field, value in (("category", category), ("place", place), ("author", author)):
+            if value is None:
+                continue
+            code = self.dictionaries[field].codes.get(value)
+            if code is None:
+                return []
+            codes = self.codes[field]
+            if indices is None:
+                indices = [i for i, c in enumerate(codes) if c == code]
+            else:
+                indices = [i for i in indices if codes[i] == code]
+
+        if date_from is not None or date_to is not None:
+            low = date_from.toordinal() if date_from is not None else NO_DATE + 1
+            high = date_to.toordinal() if date_to is not None else date.max.toordinal()
+            dates = self.dates
+            if indices is None:
+                indices = [i for i, d in enumerate(dates) if low <= d <= high]
+            else:
+                indices = [i for i in indices if low <= dates[i] <= high]
+
+        return indices if indices is not None else list(range(len(self)))
+
+    def date_histogram(self, period: str = "month") -> Dict[str, int]:
+        if period not in ("day", "month", "year"):
+            raise ValueError("period must be one of: day, month, year")
+        histogram: Dict[str, int] = {}
+        for ordinal, count in sorted(Counter(self.dates).items()):
+            if ordinal == NO_DATE:
+                continue
+            day = date.fromordinal(ordinal)
+            if period == "day":
+                key = day.isoformat()
+            elif period == "month":
+                key = f"{day.year:04d}-{day.month:02d}"
+            else:
+                key = f"{day.year:04d}"
+            histogram[key] = histogram.get(key, 0) + count
+        return histogram
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional
 from models.event import Event
+from models.event_filter import EventFilter
 
 
 class EventRepository(ABC):
@@ -8,8 +9,17 @@ class EventRepository(ABC):
     def get_all(self) -> List[Event]:
         pass
 
+    def iter_all(self) -> Iterator[Event]:
+        return iter(self.get_all())
+
+    def data_version(self) -> Optional[str]:
+        return None
+
+    def last_modified(self) -> Optional[float]:
+        return None
+
     @abstractmethod
-    def get_by_id(self, event_id: int) -> Event:
+    def get_by_id(self, event_id: int) -> Optional[Event]:
         pass
 
     @abstractmethod
@@ -19,3 +29,32 @@ class EventRepository(ABC):
     @abstractmethod
     def update(self, event: Event) -> None:
         pass
+
+    @abstractmethod
+    def delete(self, event_id: int) -> None:
+        pass
+
+    def add_events(self, events: List[Event]) -> None:
+        for event in events:
+            self.add(event)
+
+    def update_events(self, events: List[Event]) -> None:
+        for event in events:
+            self.update(event)
+
+    def delete_events(self, event_ids: List[int]) -> None:
+        for event_id in event_ids:
+            self.delete(event_id)
+
+    def find(self, event_filter: EventFilter, after_id: Optional[int] = None,
+             limit: Optional[int] = None) -> List[Event]:
+        events = []
+        for event in self.iter_all():
+            if after_id is not None and event.id <= after_id:
+                continue
+            if not event_filter.matches(event):
+                continue
+            events.append(event)
+            if limit is not None and len(events) >= limit:
+                break
+        return events
@@ -1,80 +1,338 @@
-from typing import List
+import bisect
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
 from models.event import Event
+from models.event_filter import EventFilter
 from repositories.event_repository import EventRepository
+from utils.locks import FileLock
 from lxml import etree
 
 
+@dataclass
+class _Snapshot:
+    base: BinaryIO
+    puts: Dict[int, Event] = field(default_factory=dict)
+    deleted: Set[int] = field(default_factory=set)
+    records: int = 0
+    journal_end: int = 0
+    last_id: int = 0
+    legacy_rows: bool = False
+
+
 class XmlEventRepository(EventRepository):
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, journal: bool = False, compact_threshold: int = 1000):
         self.file_path = file_path
+        self.journal_path = file_path + ".journal" if journal else None
+        self.compact_threshold = compact_threshold
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._lock = FileLock(file_path + ".lock")
+        self._load_lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._cache_version: Optional[Tuple[int, ...]] = None
+        self._cache: Dict[int, Event] = {}
+        self._ids: List[int] = []
+        self._journal_records = 0
+        self._journal_end = 0
+        self._legacy_rows = False
+        self._last_id = 0
 
-    def _get_next_id(self, events: List[Event]) -> int:
-        if len(events) == 0:
-            return 1
-        else:
-            return max(event.id for event in events) + 1
+    def _count_read(self, size: int) -> None:
+        with self._stats_lock:
+            self.bytes_read += size
 
-    def get_all(self) -> List[Event]:
-        with open(self.file_path, "rb") as f:
-            xml = f.read()
-            root = etree.fromstring(xml)
+    def _get_next_id(self) -> int:
+        self._last_id += 1
+        return self._last_id
 
-        events = []
-        for event_xml in root.xpath("//event"):
-            event_dict = {key: value for key, value in event_xml.attrib.items()}
-            event = Event.from_dict(event_dict)
+    def _version(self) -> Tuple[int, ...]:
+        stat = os.stat(self.file_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if self.journal_path is not None:
+            try:
+                stat = os.stat(self.journal_path)
+                version += (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                version += (0, 0)
+        return version
 
-            events.append(event)
+    def data_version(self) -> Optional[str]:
+        return "-".join(str(part) for part in self._version())
 
-        return events
+    def last_modified(self) -> Optional[float]:
+        version = self._version()
+        return max(version[0::2]) / 1e9
 
-    def get_by_id(self, event_id: int) -> Event:
-        with open(self.file_path, "rb") as f:
-            xml = f.read()
-            root = etree.fromstring(xml)
-
-        event_xml = root.xpath(f"//event[@id='{event_id}']")[0]
+    @staticmethod
+    def _event_from_xml(event_xml) -> Event:
         return Event.from_dict(event_xml.attrib)
 
-    def add(self, event: Event) -> None:
-        with open(self.file_path, "rb") as f:
-            xml = f.read()
-            root = etree.fromstring(xml)
+    @staticmethod
+    def _event_to_xml(event: Event):
+        return etree.Element("event", {key: str(value) for key, value in event.to_dict().items()
+                                       if value is not None})
+
+    def _load(self) -> Dict[int, Event]:
+        with self._load_lock:
+            version = self._version()
+            if version == self._cache_version:
+                self.cache_hits += 1
+                return self._cache
+
+            self.cache_misses += 1
+            snapshot = self._snapshot()
+            events = sorted(self._iter_snapshot(snapshot), key=lambda event: event.id)
+            self._last_id = snapshot.last_id
+            self._journal_records = snapshot.records
+            self._journal_end = snapshot.journal_end
+            self._legacy_rows = snapshot.legacy_rows
+
+            self._cache_version = version
+            self._cache = {event.id: event for event in events}
+            self._ids = list(self._cache)
+            return self._cache
+
+    def _load_ids(self) -> Tuple[Dict[int, Event], List[int]]:
+        with self._load_lock:
+            return self._load(), self._ids
+
+    def _snapshot(self) -> _Snapshot:
+        snapshot = _Snapshot(base=open(self.file_path, "rb"))
+        size = os.fstat(snapshot.base.fileno()).st_size
+        if self.journal_path is not None and os.path.exists(self.journal_path):
+            size += self._replay_journal(snapshot)
+        self._count_read(size)
+        return snapshot
+
+    def _replay_journal(self, snapshot: _Snapshot) -> int:
+        size = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                size += len(line)
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                event_id = record["id"]
+                if record["op"] == "delete":
+                    snapshot.puts.pop(event_id, None)
+                    snapshot.deleted.add(event_id)
+                else:
+                    if record["op"] == "add":
+                        snapshot.last_id = max(snapshot.last_id, event_id)
+                    event = Event.from_dict(record["event"])
+                    event.id = event_id
+                    snapshot.puts[event_id] = event
+                    snapshot.deleted.discard(event_id)
+                snapshot.records += 1
+                snapshot.journal_end += len(line)
+        return size
+
+    def _iter_snapshot(self, snapshot: _Snapshot) -> Iterator[Event]:
+        with snapshot.base:
+            for action, event_xml in etree.iterparse(snapshot.base, events=("start", "end")):
+                if action == "start":
+                    if event_xml.getparent() is None:
+                        snapshot.last_id = max(snapshot.last_id, int(event_xml.get("last-id", 0)))
+                    continue
+                if event_xml.tag != "event":
+                    continue
+                event = self._event_from_xml(event_xml)
+                event_xml.clear()
+                while event_xml.getprevious() is not None:
+                    del event_xml.getparent()[0]
+                if event.id is None:
+                    snapshot.last_id += 1
+                    event.id = snapshot.last_id
+                    snapshot.legacy_rows = True
+                else:
+                    snapshot.last_id = max(snapshot.last_id, event.id)
+                if event.id in snapshot.deleted:
+                    continue
+                yield snapshot.puts.pop(event.id, event)
+        yield from snapshot.puts.values()
+
+    def _append_journal(self, records: List[dict]) -> None:
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+        with open(self.journal_path, "ab") as f:
+            if f.tell() > self._journal_end:
+                f.truncate(self._journal_end)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += len(records)
+        self._journal_end += len(data)
+        self.bytes_written += len(data)
+
+    @staticmethod
+    def _put_record(op: str, event: Event) -> dict:
+        return {"op": op, "id": event.id, "event": event.to_dict()}
+
+    def _write(self, events: Dict[int, Event]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        mode = os.stat(self.file_path).st_mode & 0o7777
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with etree.xmlfile(f, encoding="UTF-8") as xf:
+                    xf.write_declaration()
+                    with xf.element("events", {"last-id": str(self._last_id)}):
+                        for event in events.values():
+                            xf.write("\n    ", self._event_to_xml(event))
+                        xf.write("\n")
+                f.flush()
+                os.fsync(f.fileno())
+                self.bytes_written += f.tell()
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.file_path)
+            if self.journal_path is not None and os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.invalidate_cache()
+            raise
+        self._journal_records = 0
+        self._journal_end = 0
+        self._legacy_rows = False
+        self._cache_version = self._version()
+
+    def _save(self, events: Dict[int, Event], records: List[dict]) -> None:
+        if self.journal_path is None or self._legacy_rows:
+            self._write(events)
+            return
+
+        try:
+            self._append_journal(records)
+        except BaseException:
+            self.invalidate_cache()
+            raise
+        self._cache_version = self._version()
+        if self._journal_records >= self.compact_threshold:
+            self._write(events)
+
+    def compact(self) -> None:
+        with self._lock.write():
+            self._write(self._load())
 
-        events = []
-        for event_xml in root.xpath("//event"):
-            event_dict = {key: value for key, value in event_xml.attrib.items()}
-            event = Event.from_dict(event_dict)
+    def invalidate_cache(self) -> None:
+        self._cache_version = None
+        self._cache = {}
+        self._ids = []
 
-            events.append(event)
+    def _remove_id(self, event_id: int) -> None:
+        position = bisect.bisect_left(self._ids, event_id)
+        if position < len(self._ids) and self._ids[position] == event_id:
+            del self._ids[position]
 
-        event.id = self._get_next_id(events)
-        event_xml = etree.Element("event", event.to_dict())
-        event_xml.set("id", str(event.id))
-        root.append(event_xml)
+    def cache_info(self) -> dict:
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
 
-        with open(self.file_path, "wb") as f:
-            f.write(etree.tostring(root, pretty_print=True))
+    def iter_all(self) -> Iterator[Event]:
+        with self._lock.read():
+            snapshot = self._snapshot()
+        return self._iter_snapshot(snapshot)
+
+    def get_all(self) -> List[Event]:
+        with self._lock.read():
+            return [event.copy() for event in self._load().values()]
+
+    def get_by_id(self, event_id: int) -> Optional[Event]:
+        with self._lock.read():
+            event = self._load().get(int(event_id))
+            return event.copy() if event is not None else None
+
+    def find(self, event_filter: EventFilter, after_id: Optional[int] = None,
+             limit: Optional[int] = None) -> List[Event]:
+        with self._lock.read():
+            cache, ids = self._load_ids()
+            start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+            events = []
+            for position in range(start, len(ids)):
+                event = cache[ids[position]]
+                if not event_filter.matches(event):
+                    continue
+                events.append(event.copy())
+                if limit is not None and len(events) >= limit:
+                    break
+            return events
+
+    def add(self, event: Event) -> None:
+        with self._lock.write():
+            events = self._load()
+
+            event.id = self._get_next_id()
+            events[event.id] = event.copy()
+            self._ids.append(event.id)
+
+            self._save(events, [self._put_record("add", event)])
 
     def update(self, event: Event) -> None:
-        with open(self.file_path, "rb") as f:
-            xml = f.read()
-            root = etree.fromstring(xml)
+        with self._lock.write():
+            events = self._load()
 
-        event_xml = root.xpath(f"//event[@id='{event.id}']")[0]
-        for attr, value in event.to_dict().items():
-            event_xml.set(attr, str(value))
+            if int(event.id) not in events:
+                return
+            events[int(event.id)] = event.copy()
 
-        with open(self.file_path, "wb") as f:
-            f.write(etree.tostring(root, pretty_print=True))
+            self._save(events, [self._put_record("update", event)])
 
     def delete(self, event_id: int) -> None:
-        with open(self.file_path, "rb") as f:
-            xml = f.read()
-            root = etree.fromstring(xml)
+        with self._lock.write():
+            events = self._load()
+
+            if events.pop(int(event_id), None) is None:
+                return
+            self._remove_id(int(event_id))
+
+            self._save(events, [{"op": "delete", "id": int(event_id)}])
+
+    def add_events(self, events: List[Event]) -> None:
+        with self._lock.write():
+            cache = self._load()
+
+            records = []
+            for event in events:
+                event.id = self._get_next_id()
+                cache[event.id] = event.copy()
+                self._ids.append(event.id)
+                records.append(self._put_record("add", event))
+
+            if records:
+                self._save(cache, records)
+
+    def update_events(self, events: List[Event]) -> None:
+        with self._lock.write():
+            cache = self._load()
+
+            records = []
+            for event in events:
+                if int(event.id) not in cache:
+                    continue
+                cache[int(event.id)] = event.copy()
+                records.append(self._put_record("update", event))
+
+            if records:
+                self._save(cache, records)
+
+    def delete_events(self, event_ids: List[int]) -> None:
+        with self._lock.write():
+            cache = self._load()
 
-        event_xml = root.xpath(f"//event[@id='{event_id}']")[0]
-        root.remove(event_xml)
+            records = []
+            for event_id in event_ids:
+                if cache.pop(int(event_id), None) is None:
+                    continue
+                self._remove_id(int(event_id))
+                records.append({"op": "delete", "id": int(event_id)})
 
-        with open(self.file_path, "wb") as f:
-            f.write(etree.tostring(root, pretty_print=True))
+            if records:
+                self._save(cache, records)
@@ -1,20 +1,310 @@
-from typing import List
+import asyncio
+import functools
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Set, Tuple
 from models.event import Event
+from models.event_filter import EventFilter
 from repositories.event_repository import EventRepository
+from services.indexes import DateIndex, FieldIndex, TextIndex
+from utils.query import Cursor
+
+INDEXED_FIELDS = ("category", "author", "place")
+SEARCH_FIELDS = {"title": 2, "announcement": 1, "description": 1}
+DATE_PAGE_SIZE = 500
 
 
 class EventService:
-    def __init__(self, event_repository: EventRepository):
+    def __init__(self, event_repository: EventRepository, max_workers: int = 4):
         self.event_repository = event_repository
+        self.max_workers = max_workers
+        self._listeners: List[Callable[[], None]] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._index_lock = threading.RLock()
+        self._field_index = FieldIndex(INDEXED_FIELDS)
+        self._text_index = TextIndex(SEARCH_FIELDS)
+        self._date_index = DateIndex()
+        self._indexes = (self._field_index, self._text_index, self._date_index)
+        self._indexes_built = False
+        self._indexed_version: Optional[str] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="event-service")
+        return self._executor
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self) -> None:
+        for listener in self._listeners:
+            listener()
+
+    def _ensure_indexes(self) -> None:
+        version = self.event_repository.data_version()
+        if self._indexes_built and (version is None or version == self._indexed_version):
+            return
+        events = self.event_repository.get_all()
+        for index in self._indexes:
+            index.build(events)
+        self._indexes_built = True
+        self._indexed_version = version
+
+    def _index_write(self, write: Callable[[], None], added: Iterable[Event] = (),
+                     updated: Iterable[Event] = (), deleted: Iterable[int] = ()) -> None:
+        with self._index_lock:
+            fresh = self._indexes_built and self._indexed_version == self.event_repository.data_version()
+            write()
+            if not self._indexes_built:
+                return
+            if not fresh:
+                self._indexes_built = False
+                return
+            for index in self._indexes:
+                for event in added:
+                    index.add(event)
+                for event in updated:
+                    if event.id in self._field_index:
+                        index.update(event)
+                for event_id in deleted:
+                    index.remove(int(event_id))
+            self._indexed_version = self.event_repository.data_version()
+
+    def _lookup_ids(self, criteria: dict) -> Optional[Set[int]]:
+        unknown = set(criteria) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"cannot search by {', '.join(sorted(unknown))}")
+        with self._index_lock:
+            self._ensure_indexes()
+            return self._field_index.intersect({key: value for key, value in criteria.items() if value is not None})
+
+    def _events_for_ids(self, event_ids: Iterable[int]) -> List[Event]:
+        events = []
+        for event_id in sorted(event_ids):
+            event = self.event_repository.get_by_id(event_id)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def find_by(self, **criteria) -> List[Event]:
+        event_ids = self._lookup_ids(criteria)
+        if event_ids is None:
+            return self.get_all_events()
+        return self._events_for_ids(event_ids)
+
+    def find_by_category(self, category: str) -> List[Event]:
+        return self.find_by(category=category)
+
+    def find_by_author(self, author: str) -> List[Event]:
+        return self.find_by(author=author)
+
+    def find_by_place(self, place: str) -> List[Event]:
+        return self.find_by(place=place)
+
+    def events_between(self, start: Optional[date] = None, end: Optional[date] = None,
+                       limit: Optional[int] = None) -> List[Event]:
+        with self._index_lock:
+            self._ensure_indexes()
+            event_ids = self._date_index.between(start.toordinal() if start is not None else None,
+                                                 end.toordinal() if end is not None else None, limit)
+        events = []
+        for event_id in event_ids:
+            event = self.event_repository.get_by_id(event_id)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def search(self, query: str, limit: int = 10) -> List[Event]:
+        with self._index_lock:
+            self._ensure_indexes()
+            hits = self._text_index.search(query, limit)
+        events = []
+        for event_id, _ in hits:
+            event = self.event_repository.get_by_id(event_id)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def data_version(self) -> Optional[str]:
+        return self.event_repository.data_version()
+
+    def last_modified(self) -> Optional[float]:
+        return self.event_repository.last_modified()
 
     def get_all_events(self) -> List[Event]:
         return self.event_repository.get_all()
 
-    def get_event_by_id(self, event_id: int) -> Event:
+    @staticmethod
+    def _is_date_range(event_filter: Optional[EventFilter]) -> bool:
+        return (event_filter is not None and
+                (event_filter.date_from is not None or event_filter.date_to is not None) and
+                event_filter.category is None and event_filter.author is None and event_filter.place is None)
+
+    @staticmethod
+    def _check_cursor(after: Optional[Cursor], date_ordered: bool) -> None:
+        if after is not None and isinstance(after, tuple) != date_ordered:
+            raise ValueError("invalid cursor")
+
+    def _find_events_by_date(self, event_filter: EventFilter, after: Optional[Tuple[int, int]],
+                             limit: Optional[int]) -> Tuple[List[Event], Optional[Tuple[int, int]]]:
+        start = event_filter.date_from.toordinal() if event_filter.date_from is not None else None
+        end = event_filter.date_to.toordinal() if event_filter.date_to is not None else None
+        events = []
+        keys = []
+        while True:
+            batch = limit + 1 - len(events) if limit is not None else None
+            with self._index_lock:
+                self._ensure_indexes()
+                found = self._date_index.keys(start, end, batch, after)
+            for key in found:
+                event = self.event_repository.get_by_id(key[1])
+                if event is not None and event_filter.matches(event):
+                    events.append(event)
+                    keys.append(key)
+            if batch is None or len(found) < batch or len(events) > limit:
+                break
+            after = found[-1]
+
+        if limit is None or len(events) <= limit:
+            return events, None
+        return events[:limit], keys[limit - 1]
+
+    def _iter_events_by_date(self, event_filter: EventFilter,
+                             after: Optional[Tuple[int, int]]) -> Iterator[Event]:
+        while True:
+            events, after = self._find_events_by_date(event_filter, after, DATE_PAGE_SIZE)
+            yield from events
+            if after is None:
+                return
+
+    def _iter_events(self, event_filter: Optional[EventFilter], after_id: Optional[int]) -> Iterator[Event]:
+        for event in self.event_repository.iter_all():
+            if after_id is not None and event.id <= after_id:
+                continue
+            if event_filter is None or event_filter.matches(event):
+                yield event
+
+    def iter_events(self, event_filter: Optional[EventFilter] = None,
+                    after: Optional[Cursor] = None) -> Iterator[Event]:
+        date_ordered = self._is_date_range(event_filter)
+        self._check_cursor(after, date_ordered)
+        if date_ordered:
+            return self._iter_events_by_date(event_filter, after)
+        return self._iter_events(event_filter, after)
+
+    def find_events(self, event_filter: EventFilter, after: Optional[Cursor] = None,
+                    limit: Optional[int] = None) -> Tuple[List[Event], Optional[Cursor]]:
+        date_ordered = self._is_date_range(event_filter)
+        self._check_cursor(after, date_ordered)
+        if date_ordered:
+            return self._find_events_by_date(event_filter, after, limit)
+
+        after_id = after
+        criteria = {"category": event_filter.category, "author": event_filter.author, "place": event_filter.place}
+        event_ids = self._lookup_ids(criteria)
+        if event_ids is not None:
+            events = []
+            for event_id in sorted(event_ids):
+                if after_id is not None and event_id <= after_id:
+                    continue
+                event = self.event_repository.get_by_id(event_id)
+                if event is None or not event_filter.matches(event):
+                    continue
+                events.append(event)
+                if limit is not None and len(events) > limit:
+                    break
+        elif limit is None:
+            events = self.event_repository.find(event_filter, after_id)
+        else:
+            events = self.event_repository.find(event_filter, after_id, limit + 1)
+
+        if limit is None or len(events) <= limit:
+            return events, None
+        events = events[:limit]
+        return events, events[-1].id
+
+    def get_event_by_id(self, event_id: int) -> Optional[Event]:
         return self.event_repository.get_by_id(event_id)
 
     def add_event(self, event: Event) -> None:
-        self.event_repository.add(event)
+        self._index_write(lambda: self.event_repository.add(event), added=[event])
+        self._notify()
 
     def update_event(self, event: Event) -> None:
-        self.event_repository.update(event)
+        self._index_write(lambda: self.event_repository.update(event), updated=[event])
+        self._notify()
+
+    def delete_event(self, event_id: int) -> None:
+        self._index_write(lambda: self.event_repository.delete(event_id), deleted=[event_id])
+        self._notify()
+
+    def add_events(self, events: List[Event]) -> None:
+        self._index_write(lambda: self.event_repository.add_events(events), added=events)
+        self._notify()
+
+    def update_events(self, events: List[Event]) -> None:
+        self._index_write(lambda: self.event_repository.update_events(events), updated=events)
+        self._notify()
+
+    def delete_events(self, event_ids: List[int]) -> None:
+        self._index_write(lambda: self.event_repository.delete_events(event_ids), deleted=event_ids)
+        self._notify()
+
+    async def aget_all_events(self) -> List[Event]:
+        return await self._run(self.get_all_events)
+
+    def aiter_events(self, event_filter: Optional[EventFilter] = None, after: Optional[Cursor] = None,
+                     batch_size: int = 500) -> AsyncIterator[Event]:
+        return self._abatches(self.iter_events(event_filter, after), batch_size)
+
+    async def _abatches(self, events: Iterator[Event], batch_size: int) -> AsyncIterator[Event]:
+        while True:
+            batch = await self._run(lambda: list(itertools.islice(events, batch_size)))
+            if not batch:
+                return
+            for event in batch:
+                yield event
+
+    async def afind_events(self, event_filter: EventFilter, after: Optional[Cursor] = None,
+                           limit: Optional[int] = None) -> Tuple[List[Event], Optional[Cursor]]:
+        return await self._run(self.find_events, event_filter, after, limit)
+
+    async def aevents_between(self, start: Optional[date] = None, end: Optional[date] = None,
+                              limit: Optional[int] = None) -> List[Event]:
+        return await self._run(self.events_between, start, end, limit)
+
+    async def asearch(self, query: str, limit: int = 10) -> List[Event]:
+        return await self._run(self.search, query, limit)
+
+    async def aget_event_by_id(self, event_id: int) -> Optional[Event]:
+        return await self._run(self.get_event_by_id, event_id)
+
+    async def aadd_event(self, event: Event) -> None:
+        await self._run(self.add_event, event)
+
+    async def aupdate_event(self, event: Event) -> None:
+        await self._run(self.update_event, event)
+
+    async def adelete_event(self, event_id: int) -> None:
+        await self._run(self.delete_event, event_id)
+
+    async def aadd_events(self, events: List[Event]) -> None:
+        await self._run(self.add_events, events)
+
+    async def aupdate_events(self, events: List[Event]) -> None:
+        await self._run(self.update_events, events)
+
+    async def adelete_events(self, event_ids: List[int]) -> None:
+        await self._run(self.delete_events, event_ids)
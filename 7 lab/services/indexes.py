@@ -0,0 +1,203 @@
+import bisect
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from models.event import Event
+from utils.dates import date_ordinal
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class FieldIndex:
+    def __init__(self, fields: Tuple[str, ...]):
+        self.fields = fields
+        self._postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in fields}
+        self._values: Dict[int, Tuple[str, ...]] = {}
+
+    def __contains__(self, event_id: int) -> bool:
+        return event_id in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def build(self, events: Iterable[Event]) -> None:
+        self.clear()
+        for event in events:
+            self.add(event)
+
+    def clear(self) -> None:
+        self._postings = {field: {} for field in self.fields}
+        self._values = {}
+
+    def add(self, event: Event) -> None:
+        values = tuple(getattr(event, field) for field in self.fields)
+        self._values[event.id] = values
+        for field, value in zip(self.fields, values):
+            self._postings[field].setdefault(value, set()).add(event.id)
+
+    def remove(self, event_id: int) -> None:
+        values = self._values.pop(event_id, None)
+        if values is None:
+            return
+        for field, value in zip(self.fields, values):
+            postings = self._postings[field]
+            ids = postings[value]
+            ids.discard(event_id)
+            if not ids:
+                del postings[value]
+
+    def update(self, event: Event) -> None:
+        if event.id not in self._values:
+            return
+        self.remove(event.id)
+        self.add(event)
+
+    def lookup(self, field: str, value: str) -> Set[int]:
+        if field not in self._postings:
+            raise ValueError(f"no index on field {field!r}")
+        return self._postings[field].get(value, set())
+
+    def intersect(self, criteria: Dict[str, str]) -> Optional[Set[int]]:
+        postings = sorted((self.lookup(field, value) for field, value in criteria.items()), key=len)
+        if not postings:
+            return None
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+
+class TextIndex:
+    def __init__(self, fields: Dict[str, int]):
+        self.fields = fields
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: Dict[int, Counter] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def build(self, events: Iterable[Event]) -> None:
+        self.clear()
+        for event in events:
+            self.add(event)
+
+    def clear(self) -> None:
+        self._postings = {}
+        self._documents = {}
+
+    def add(self, event: Event) -> None:
+        terms = Counter()
+        for field, weight in self.fields.items():
+            for token in tokenize(getattr(event, field)):
+                terms[token] += weight
+        self._documents[event.id] = terms
+        for token, frequency in terms.items():
+            self._postings.setdefault(token, {})[event.id] = frequency
+
+    def remove(self, event_id: int) -> None:
+        terms = self._documents.pop(event_id, None)
+        if terms is None:
+            return
+        for token in terms:
+            postings = self._postings[token]
+            del postings[event_id]
+            if not postings:
+                del self._postings[token]
+
+    def update(self, event: Event) -> None:
+        if event.id not in self._documents:
+            return
+        self.remove(event.id)
+        self.add(event)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        postings = []
+        for token in tokens:
+            token_postings = self._postings.get(token)
+            if token_postings is None:
+                return []
+            postings.append(token_postings)
+        postings.sort(key=len)
+
+        total = len(self._documents)
+        weights = [math.log(1 + total / len(token_postings)) for token_postings in postings]
+        scores = {}
+        for event_id, frequency in postings[0].items():
+            score = frequency * weights[0]
+            for token_postings, weight in zip(postings[1:], weights[1:]):
+                other = token_postings.get(event_id)
+                if other is None:
+                    break
+                score += other * weight
+            else:
+                scores[event_id] = score
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+class DateIndex:
+    def __init__(self, field: str = "date"):
+        self.field = field
+        self._keys: List[Tuple[int, int]] = []
+        self._ordinals: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def build(self, events: Iterable[Event]) -> None:
+        self.clear()
+        parsed: Dict[str, Optional[int]] = {}
+        for event in events:
+            value = getattr(event, self.field)
+            if value not in parsed:
+                parsed[value] = date_ordinal(value)
+            ordinal = parsed[value]
+            if ordinal is not None:
+                self._ordinals[event.id] = ordinal
+        self._keys = sorted((ordinal, event_id) for event_id, ordinal in self._ordinals.items())
+
+    def clear(self) -> None:
+        self._keys = []
+        self._ordinals = {}
+
+    def add(self, event: Event) -> None:
+        ordinal = date_ordinal(getattr(event, self.field))
+        if ordinal is None:
+            return
+        self._ordinals[event.id] = ordinal
+        bisect.insort(self._keys, (ordinal, event.id))
+
+    def remove(self, event_id: int) -> None:
+        ordinal = self._ordinals.pop(event_id, None)
+        if ordinal is None:
+            return
+        position = bisect.bisect_left(self._keys, (ordinal, event_id))
+        del self._keys[position]
+
+    def update(self, event: Event) -> None:
+        self.remove(event.id)
+        self.add(event)
+
+    def keys(self, start: Optional[int] = None, end: Optional[int] = None, limit: Optional[int] = None,
+             after: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+        low = bisect.bisect_left(self._keys, (start, 0)) if start is not None else 0
+        if after is not None:
+            low = max(low, bisect.bisect_right(self._keys, after))
+        high = bisect.bisect_right(self._keys, (end, float("inf"))) if end is not None else len(self._keys)
+        if limit is not None:
+            high = min(high, low + limit)
+        return self._keys[low:high]
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None, limit: Optional[int] = None,
+                after: Optional[Tuple[int, int]] = None) -> List[int]:
+        return [event_id for _, event_id in self.keys(start, end, limit, after)]
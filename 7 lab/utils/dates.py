@@ -0,0 +1,20 @@
+from datetime import date, datetime
+from typing import Optional
+
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d")
+
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def date_ordinal(value: Optional[str]) -> Optional[int]:
+    parsed = parse_date(value)
+    return parsed.toordinal() if parsed is not None else None
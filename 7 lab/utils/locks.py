@@ -0,0 +1,86 @@
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class ReadWriteLock:
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class FileLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = ReadWriteLock()
+
+    @contextmanager
+    def _flock(self, operation: int):
+        if fcntl is None:
+            yield
+            return
+        with open(self.path, "a") as f:
+            fcntl.flock(f.fileno(), operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def read(self):
+        with self._lock.read():
+            with self._flock(fcntl.LOCK_SH if fcntl else 0):
+                yield
+
+    @contextmanager
+    def write(self):
+        with self._lock.write():
+            with self._flock(fcntl.LOCK_EX if fcntl else 0):
+                yield
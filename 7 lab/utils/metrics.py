@@ -0,0 +1,167 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "events"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._collectors: List[Callable[[], Dict[str, float]]] = []
+
+    def observe(self, component: str, method: str, seconds: float, failed: bool = False) -> None:
+        key = (component, method)
+        with self._lock:
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = self._durations[key] = Histogram()
+            histogram.observe(seconds)
+            if failed:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def register_collector(self, collector: Callable[[], Dict[str, float]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        name = f"{self.prefix}_method_duration_seconds"
+        lines = [f"# HELP {self.prefix}_method_calls_total Number of calls per component method.",
+                 f"# TYPE {self.prefix}_method_calls_total counter"]
+        with self._lock:
+            durations = sorted(self._durations.items())
+            errors = dict(self._errors)
+            for (component, method), histogram in durations:
+                lines.append(f'{self.prefix}_method_calls_total{{component="{component}",method="{method}"}} '
+                             f'{histogram.count}')
+
+            lines += [f"# HELP {self.prefix}_method_errors_total Number of calls that raised.",
+                      f"# TYPE {self.prefix}_method_errors_total counter"]
+            for (component, method), _ in durations:
+                lines.append(f'{self.prefix}_method_errors_total{{component="{component}",method="{method}"}} '
+                             f'{errors.get((component, method), 0)}')
+
+            lines += [f"# HELP {name} Call latency per component method.",
+                      f"# TYPE {name} histogram"]
+            for (component, method), histogram in durations:
+                labels = f'component="{component}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        for collector in self._collectors:
+            for metric, value in sorted(collector().items()):
+                kind = "counter" if metric.endswith("_total") else "gauge"
+                lines.append(f"# TYPE {self.prefix}_{metric} {kind}")
+                lines.append(f"{self.prefix}_{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _timed(func, component: str, method: str, registry: MetricsRegistry):
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = await func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                registry.observe(component, method, time.perf_counter() - start, failed)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            registry.observe(component, method, time.perf_counter() - start, True)
+            raise
+        elapsed = time.perf_counter() - start
+        if isinstance(result, Iterator):
+            return _timed_iterator(result, component, method, registry, elapsed)
+        if isinstance(result, AsyncIterator):
+            return _timed_async_iterator(result, component, method, registry, elapsed)
+        registry.observe(component, method, elapsed)
+        return result
+
+    return wrapper
+
+
+def _timed_iterator(iterator: Iterator, component: str, method: str, registry: MetricsRegistry,
+                    elapsed: float) -> Iterator:
+    failed = True
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                failed = False
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    except GeneratorExit:
+        failed = False
+        if hasattr(iterator, "close"):
+            iterator.close()
+        raise
+    finally:
+        registry.observe(component, method, elapsed, failed)
+
+
+async def _timed_async_iterator(iterator: AsyncIterator, component: str, method: str, registry: MetricsRegistry,
+                                elapsed: float) -> AsyncIterator:
+    failed = True
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                failed = False
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    except GeneratorExit:
+        failed = False
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+        raise
+    finally:
+        registry.observe(component, method, elapsed, failed)
+
+
+def instrument(obj, component: str, registry: MetricsRegistry):
+    for method, func in inspect.getmembers(obj, inspect.ismethod):
+        if method.startswith("_"):
+            continue
+        setattr(obj, method, _timed(func, component, method, registry))
+    return obj
@@ -0,0 +1,54 @@
+import base64
+import binascii
+from typing import Mapping, Optional, Tuple, Union
+from models.event_filter import EventFilter
+from utils.dates import parse_date
+
+
+Cursor = Union[int, Tuple[int, int]]
+
+
+def encode_cursor(key: Cursor) -> str:
+    value = ":".join(str(part) for part in key) if isinstance(key, tuple) else str(key)
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    if not cursor:
+        return None
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        parts = [int(part) for part in base64.urlsafe_b64decode(cursor + padding).decode().split(":")]
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("invalid cursor")
+    if len(parts) == 1:
+        return parts[0]
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    raise ValueError("invalid cursor")
+
+
+def parse_limit(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    if not value.isdigit() or int(value) == 0:
+        raise ValueError("limit must be a positive integer")
+    return int(value)
+
+
+def parse_date_arg(args: Mapping[str, str], name: str):
+    value = args.get(name)
+    if value is None:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"{name} must be a date in dd.mm.yyyy format")
+    return parsed
+
+
+def parse_event_filter(args: Mapping[str, str]) -> EventFilter:
+    return EventFilter(category=args.get("category"),
+                       place=args.get("place"),
+                       author=args.get("author"),
+                       date_from=parse_date_arg(args, "from"),
+                       date_to=parse_date_arg(args, "to"))
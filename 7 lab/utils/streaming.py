@@ -0,0 +1,32 @@
+import json
+from typing import Optional
+from models.event import Event
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class JsonArrayChunker:
+    def __init__(self, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._chunk = ["["]
+        self._size = 1
+        self._separator = ""
+
+    def add(self, event: Event) -> Optional[str]:
+        part = self._separator + json.dumps(event.to_dict(), ensure_ascii=False)
+        self._separator = ","
+        self._chunk.append(part)
+        self._size += len(part)
+        if self._size < self.chunk_size:
+            return None
+        return self._flush()
+
+    def close(self) -> str:
+        self._chunk.append("]")
+        return self._flush()
+
+    def _flush(self) -> str:
+        data = "".join(self._chunk)
+        self._chunk = []
+        self._size = 0
+        return data
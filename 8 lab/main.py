@@ -1,13 +1,14 @@
 import asyncio
 import json
 import xml.etree.ElementTree as ET
-from sqlalchemy import create_engine
+from sqlalchemy import Column, Integer, String, Table
 from sqlalchemy.orm import sessionmaker, declarative_base
 from typing import List
+from engine import create_sqlite_engine
 
 
 Base = declarative_base()
-engine = create_engine('sqlite:///example.db')
+engine = create_sqlite_engine('sqlite:///example.db')
 Session = sessionmaker(bind=engine)
 
 
@@ -21,6 +22,14 @@ class Event:
         return {"title": self.title, "description": self.description, "place": self.place}
 
 
+events_table = Table('events', Base.metadata,
+                     Column('id', Integer, primary_key=True),
+                     Column('title', String),
+                     Column('description', String),
+                     Column('place', String))
+Base.registry.map_imperatively(Event, events_table)
+
+
 class Repository:
     def save(self, data):
         raise NotImplementedError
@@ -65,7 +74,7 @@ class XMLRepository(Repository):
         root = tree.getroot()
 
         events = []
-        for event_elem in root.findall("event"):
+        for event_elem in root.findall("events"):
             title_elem = event_elem.find("title")
             description_elem = event_elem.find("description")
             place_elem = event_elem.find("place")
@@ -100,6 +109,7 @@ class RepositoryFactory:
     @staticmethod
     def create_repository(storage_type):
         if storage_type == 'relational':
+            Base.metadata.create_all(engine)
             session = Session()
             return RelationalRepository(session)
         elif storage_type == 'xml':
@@ -167,6 +177,8 @@ async def test_coroutines(storage_type):
 
     print("\n[тест корутинов]: успешно")
 
-test_repository_factory()
-storage_type = input("\n[выберите тип создаваемого хранилища]:\n> xml\n> json\n> relational\n\n[]: ")
-asyncio.run(test_coroutines(storage_type))
+
+if __name__ == '__main__':
+    test_repository_factory()
+    storage_type = input("\n[выберите тип создаваемого хранилища]:\n> xml\n> json\n> relational\n\n[]: ")
+    asyncio.run(test_coroutines(storage_type))
@@ -0,0 +1,379 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPERATIONS = ("get_all", "get_by_id", "add", "update", "delete")
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+GET_ALL_RUNS = 5
+
+
+def synthetic_records(size: int, seed: int = 0) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    categories = [f"Category {i}" for i in range(20)]
+    places = [f"Place {i}" for i in range(200)]
+    authors = [f"Author {i}" for i in range(1000)]
+    return [{
+        "title": f"Event {i}",
+        "author": authors[min(int(rng.paretovariate(1.2)) - 1, len(authors) - 1)],
+        "announcement": f"Announcement {i}",
+        "description": f"Description of event {i} " + " ".join(rng.choices(("music", "science", "film", "sport", "art"), k=5)),
+        "date": f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2020, 2025)}",
+        "place": rng.choice(places),
+        "category": rng.choice(categories)
+    } for i in range(size)]
+
+
+class Backend:
+    lab = None
+    full_rewrite = False
+
+    def setup(self, records: List[Dict[str, str]]) -> List[int]:
+        raise NotImplementedError
+
+    def get_all(self):
+        raise NotImplementedError
+
+    def get_by_id(self, event_id: int):
+        raise NotImplementedError
+
+    def add(self, record: Dict[str, str]) -> int:
+        raise NotImplementedError
+
+    def update(self, event_id: int, record: Dict[str, str]) -> None:
+        raise NotImplementedError
+
+    def delete(self, event_id: int) -> None:
+        raise NotImplementedError
+
+
+class Lab7XmlBackend(Backend):
+    lab = "7 lab"
+
+    def __init__(self, journal: bool):
+        self.journal = journal
+
+    def setup(self, records):
+        from models.event import Event
+        from repositories.xml_event_repository import XmlEventRepository
+
+        with open("events.xml", "w") as f:
+            f.write("<events/>")
+        self.event_cls = Event
+        self.repository = XmlEventRepository("events.xml", journal=self.journal)
+        events = [Event.from_dict(record) for record in records]
+        self.repository.add_events(events)
+        return [event.id for event in events]
+
+    def get_all(self):
+        self.repository.invalidate_cache()
+        return self.repository.get_all()
+
+    def get_by_id(self, event_id):
+        return self.repository.get_by_id(event_id)
+
+    def add(self, record):
+        event = self.event_cls.from_dict(record)
+        self.repository.add(event)
+        return event.id
+
+    def update(self, event_id, record):
+        event = self.event_cls.from_dict(dict(record, id=event_id))
+        self.repository.update(event)
+
+    def delete(self, event_id):
+        self.repository.delete(event_id)
+
+
+class Lab8FileBackend(Backend):
+    lab = "8 lab"
+    full_rewrite = True
+
+    def __init__(self, storage_type: str):
+        self.storage_type = storage_type
+
+    def setup(self, records):
+        from main import RepositoryFactory
+
+        self.repository = RepositoryFactory.create_repository(self.storage_type)
+        self.repository.save(records)
+        return list(range(len(records)))
+
+    def _records(self):
+        return [event.to_dict() for event in self.repository.load()]
+
+    def get_all(self):
+        return self.repository.load()
+
+    def get_by_id(self, event_id):
+        return self.repository.load()[event_id]
+
+    def add(self, record):
+        records = self._records()
+        records.append({"title": record["title"], "description": record["description"], "place": record["place"]})
+        self.repository.save(records)
+        return len(records) - 1
+
+    def update(self, event_id, record):
+        records = self._records()
+        records[event_id] = {"title": record["title"], "description": record["description"], "place": record["place"]}
+        self.repository.save(records)
+
+    def delete(self, event_id):
+        records = self._records()
+        del records[event_id]
+        self.repository.save(records)
+
+
+class Lab8RelationalBackend(Backend):
+    # RelationalRepository only exposes save and load, so lookups, updates and deletes are unsupported.
+    lab = "8 lab"
+
+    def setup(self, records):
+        from main import Event, RepositoryFactory
+
+        self.event_cls = Event
+        self.repository = RepositoryFactory.create_repository("relational")
+        for record in records:
+            self.repository.save(Event(record["title"], record["description"], record["place"]))
+        return list(range(1, len(records) + 1))
+
+    def get_all(self):
+        return self.repository.load()
+
+    def add(self, record):
+        self.repository.save(self.event_cls(record["title"], record["description"], record["place"]))
+
+
+class Lab5DeclarativeBackend(Backend):
+    lab = "5 lab"
+
+    def setup(self, records):
+        import main
+
+        main.Base.metadata.create_all(main.engine)
+        self.event_cls = main.Event
+        self.session = main.Session()
+        self.repository = main.EventRepository(self.session)
+        events = [main.Event(**record) for record in records]
+        self.session.add_all(events)
+        self.session.commit()
+        return [event.id for event in events]
+
+    def get_all(self):
+        self.session.expire_all()
+        return self.repository.get_all()
+
+    def get_by_id(self, event_id):
+        return self.repository.get(event_id)
+
+    def add(self, record):
+        event = self.event_cls(**record)
+        self.repository.add(event)
+        return event.id
+
+    def update(self, event_id, record):
+        self.repository.update(self.event_cls(id=event_id, **record))
+
+    def delete(self, event_id):
+        self.repository.delete(self.repository.get(event_id))
+
+
+class Lab5ImperativeBackend(Backend):
+    # models.Event is a frozen dataclass, so it cannot be instrumented by the imperative mappers.
+    # Writes go through the Core statements of the repositories; ORM reads are left unsupported.
+    lab = "5 lab"
+
+    def setup(self, records):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        import models
+        import orm
+        import repositories
+
+        engine = create_engine("sqlite:///example.db")
+        orm.metadata.create_all(engine)
+        self.models = models
+        self.author = models.User(1, "Author", "author@example.com", models.Group(1, "Users", True, False, False))
+        self.category = models.Category(1, "Category", "Description")
+        with engine.begin() as connection:
+            connection.execute(orm.events.insert(), [
+                dict(id=i, title=record["title"], author=1, announcement=record["announcement"],
+                     description=record["description"], date=record["date"], place=record["place"], category=1)
+                for i, record in enumerate(records, start=1)])
+        self.session = sessionmaker(bind=engine)()
+        self.repository = repositories.EventRepository(self.session)
+        self.next_id = len(records) + 1
+        return list(range(1, len(records) + 1))
+
+    def _event(self, event_id, record):
+        return self.models.Event(event_id, record["title"], self.author, record["announcement"],
+                                 record["description"], record["date"], record["place"], "", self.category, [])
+
+    def add(self, record):
+        event_id = self.next_id
+        self.next_id += 1
+        self.repository.add(self._event(event_id, record))
+        return event_id
+
+    def update(self, event_id, record):
+        self.repository.upsert(self._event(event_id, record))
+
+    def delete(self, event_id):
+        self.repository.delete(event_id)
+
+
+BACKENDS = {
+    "xml7": lambda: Lab7XmlBackend(journal=False),
+    "xml7-journal": lambda: Lab7XmlBackend(journal=True),
+    "xml8": lambda: Lab8FileBackend("xml"),
+    "json8": lambda: Lab8FileBackend("json"),
+    "relational8": Lab8RelationalBackend,
+    "sqlalchemy5": Lab5DeclarativeBackend,
+    "sqlalchemy5-imperative": Lab5ImperativeBackend,
+}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def summarize(samples: List[float]) -> dict:
+    total = sum(samples)
+    return {
+        "count": len(samples),
+        "ops_per_sec": len(samples) / total if total else None,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": max(samples) * 1000
+    }
+
+
+def peak_memory_mb() -> float:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(operation, runs: int) -> dict:
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def run_worker(backend_name: str, size: int, ops: int, seed: int) -> dict:
+    backend = BACKENDS[backend_name]()
+    sys.path.insert(0, os.path.join(ROOT, backend.lab))
+    records = synthetic_records(size + ops, seed)
+    extra = records[size:]
+    del records[size:]
+    rng = random.Random(seed)
+    result = {"backend": backend_name, "lab": backend.lab, "size": size, "operations": {}}
+
+    baseline_memory = peak_memory_mb()
+    start = time.perf_counter()
+    ids = backend.setup(records)
+    result["load_seconds"] = time.perf_counter() - start
+    del records
+
+    if backend.full_rewrite:
+        ops = min(ops, 20)
+    plans = {
+        "get_all": (lambda i: backend.get_all(), GET_ALL_RUNS),
+        "get_by_id": (lambda i: backend.get_by_id(rng.choice(ids)), ops),
+        "add": (lambda i: ids.append(backend.add(extra[i])), ops),
+        "update": (lambda i: backend.update(rng.choice(ids), extra[i]), ops),
+        "delete": (lambda i: backend.delete(ids.pop(rng.randrange(len(ids)))), ops),
+    }
+    for name in OPERATIONS:
+        operation, runs = plans[name]
+        try:
+            result["operations"][name] = measure(operation, runs)
+        except NotImplementedError:
+            result["operations"][name] = {"error": "unsupported"}
+        except Exception as e:
+            result["operations"][name] = {"error": f"{type(e).__name__}: {e}"}
+
+    result["baseline_memory_mb"] = baseline_memory
+    result["peak_memory_mb"] = peak_memory_mb()
+    if baseline_memory is not None:
+        result["memory_increase_mb"] = result["peak_memory_mb"] - baseline_memory
+    return result
+
+
+def run_isolated(backend_name: str, size: int, ops: int, seed: int, timeout: float) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        output = os.path.join(workdir, "result.json")
+        command = [sys.executable, os.path.abspath(__file__), "--worker", backend_name,
+                   "--sizes", str(size), "--ops", str(ops), "--seed", str(seed), "--output", output]
+        try:
+            completed = subprocess.run(command, cwd=workdir, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.PIPE, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {"backend": backend_name, "size": size, "error": f"timed out after {timeout:.0f}s"}
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()
+            return {"backend": backend_name, "size": size, "error": error[-1] if error else "worker failed"}
+        with open(output) as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event repository scale benchmark")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--ops", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=3600)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--worker", choices=sorted(BACKENDS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = run_worker(args.worker, args.sizes[0], args.ops, args.seed)
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+        return
+
+    results = []
+    for size in args.sizes:
+        for backend_name in args.backends:
+            print(f"{backend_name} @ {size:,} events...", flush=True)
+            results.append(run_isolated(backend_name, size, args.ops, args.seed, args.timeout))
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ops": args.ops,
+        "seed": args.seed,
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
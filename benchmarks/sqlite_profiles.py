@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import text
+from scale import ROOT, synthetic_records
+
+sys.path.insert(0, os.path.join(ROOT, "5 lab"))
+
+from engine import PROFILES, create_sqlite_engine
+
+COLUMNS = ("title", "author", "announcement", "description", "date", "place", "category")
+CREATE_TABLE = ("CREATE TABLE events (id INTEGER PRIMARY KEY, title TEXT, author TEXT, announcement TEXT, "
+                "description TEXT, date TEXT, place TEXT, category TEXT)")
+INSERT = text(f"INSERT INTO events ({', '.join(COLUMNS)}) VALUES ({', '.join(':' + c for c in COLUMNS)})")
+SELECT_BY_ID = text("SELECT * FROM events WHERE id = :id")
+SELECT_BY_CATEGORY = text("SELECT count(*) FROM events WHERE category = :category")
+
+
+def rate(count: int, seconds: float) -> float:
+    return count / seconds if seconds else None
+
+
+def bulk_writes(engine, records) -> float:
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(INSERT, records)
+    return rate(len(records), time.perf_counter() - start)
+
+
+def commit_writes(engine, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        with engine.begin() as connection:
+            connection.execute(INSERT, record)
+    return rate(len(records), time.perf_counter() - start)
+
+
+def point_reads(engine, size: int, ops: int, rng: random.Random) -> float:
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        for _ in range(ops):
+            connection.execute(SELECT_BY_ID, {"id": rng.randint(1, size)}).fetchone()
+    return rate(ops, time.perf_counter() - start)
+
+
+def scan_reads(engine, runs: int) -> float:
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        for i in range(runs):
+            connection.execute(SELECT_BY_CATEGORY, {"category": f"Category {i % 20}"}).scalar()
+    return rate(runs, time.perf_counter() - start)
+
+
+def mixed_load(engine, records, size: int, readers: int, rng: random.Random) -> dict:
+    stop = threading.Event()
+    counters = {"reads": 0, "read_errors": 0}
+    lock = threading.Lock()
+
+    def reader(seed: int):
+        reader_rng = random.Random(seed)
+        with engine.connect() as connection:
+            while not stop.is_set():
+                try:
+                    connection.execute(SELECT_BY_ID, {"id": reader_rng.randint(1, size)}).fetchone()
+                    connection.commit()
+                    key = "reads"
+                except Exception:
+                    connection.rollback()
+                    key = "read_errors"
+                with lock:
+                    counters[key] += 1
+
+    threads = [threading.Thread(target=reader, args=(rng.random(),)) for _ in range(readers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    write_errors = 0
+    for record in records:
+        try:
+            with engine.begin() as connection:
+                connection.execute(INSERT, record)
+        except Exception:
+            write_errors += 1
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {"writes_per_sec": rate(len(records) - write_errors, elapsed), "write_errors": write_errors,
+            "reads_per_sec": rate(counters["reads"], elapsed), "read_errors": counters["read_errors"]}
+
+
+def run_profile(profile: str, size: int, ops: int, readers: int, seed: int) -> dict:
+    records = synthetic_records(size + 2 * ops, seed)
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_sqlite_engine(f"sqlite:///{os.path.join(workdir, 'events.db')}", profile)
+        with engine.begin() as connection:
+            connection.execute(text(CREATE_TABLE))
+            journal_mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+        result = {
+            "profile": profile,
+            "journal_mode": journal_mode,
+            "pragmas": PROFILES[profile],
+            "bulk_writes_per_sec": bulk_writes(engine, records[:size]),
+            "commit_writes_per_sec": commit_writes(engine, records[size:size + ops]),
+            "point_reads_per_sec": point_reads(engine, size, ops * 10, rng),
+            "scan_reads_per_sec": scan_reads(engine, max(ops // 100, 5)),
+            "mixed": mixed_load(engine, records[size + ops:], size, readers, rng)
+        }
+        engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite performance profile benchmark")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=sorted(PROFILES))
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=1000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results_sqlite.json")
+    args = parser.parse_args()
+
+    results = []
+    for profile in args.profiles:
+        print(f"{profile}...", flush=True)
+        result = run_profile(profile, args.size, args.ops, args.readers, args.seed)
+        mixed = result["mixed"]
+        print(f"  bulk {result['bulk_writes_per_sec']:,.0f}/s, commits {result['commit_writes_per_sec']:,.0f}/s, "
+              f"reads {result['point_reads_per_sec']:,.0f}/s, mixed {mixed['writes_per_sec']:,.0f} writes/s "
+              f"+ {mixed['reads_per_sec']:,.0f} reads/s ({mixed['read_errors']} read errors)", flush=True)
+        results.append(result)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": args.size,
+        "ops": args.ops,
+        "readers": args.readers,
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()